@@ -7,18 +7,107 @@ import sys
 from src.filesystem import FileSystemManager, FSMode
 
 
+_RULE = "=" * 60
+
+_HELP_TEXT = """
+╔════════════════════════════════════════════════════════════════╗
+║           File System Emulator - Help                          ║
+╚════════════════════════════════════════════════════════════════╝
+
+MODE SWITCHING:
+  mode <single|two-level|hierarchical>  Switch directory structure mode
+
+FILE OPERATIONS:
+  create <filename>                    Create a new file
+  mkdir <dirname>                      Create a new directory
+  delete <name> [--recursive]          Delete file or directory
+  rm <name> [--recursive]              Alias for delete
+  rename <old> <new>                   Rename a file or folder
+  info <name>                          Show file/folder details
+
+NAVIGATION (Two-Level & Hierarchical only):
+  cd <path>                            Change directory
+  pwd                                  Print working directory
+
+VIEWING:
+  ls / list                            List directory contents
+  tree                                 Show ASCII tree structure
+  search <query>                       Search for files/directories
+
+SYSTEM:
+  reset                                Reset file system
+  logs                                 Show operation logs
+  demo                                 Run demonstration script
+  help / ?                             Show this help
+  exit / quit                          Exit the emulator
+
+EXAMPLES:
+  mode hierarchical
+  mkdir home && cd home
+  mkdir user1 && cd user1
+  create file.txt
+  tree
+  search "*.txt"
+
+"""
+
+_WELCOME_BANNER = f"""
+{_RULE}
+  File System Emulator
+  Demonstrating OS Directory Structures
+{_RULE}
+
+Type 'help' for commands or 'demo' to see a demonstration
+
+"""
+
+_DEMO_START_BANNER = f"\n{_RULE}\nRUNNING DEMONSTRATION\n{_RULE}\n"
+
+_DEMO_END_BANNER = f"\n{_RULE}\nDEMONSTRATION COMPLETE\n{_RULE}\n"
+
+
 class CLI:
     """Command Line Interface for File System Emulator"""
     
     def __init__(self):
         self.fs = FileSystemManager()
         self.running = True
+        # Prompt is rebuilt only after commands that can change mode or directory
+        self._prompt = ""
+        self._prompt_dirty = True
+        # Command name -> handler taking the argument list
+        self._dispatch = {
+            "mode": self._cmd_mode,
+            "help": self._cmd_help,
+            "?": self._cmd_help,
+            "exit": self._cmd_exit,
+            "quit": self._cmd_exit,
+            "reset": self._cmd_reset,
+            "create": self._cmd_create,
+            "mkdir": self._cmd_mkdir,
+            "delete": self._cmd_delete,
+            "rm": self._cmd_delete,
+            "rename": self._cmd_rename,
+            "info": self._cmd_info,
+            "stat": self._cmd_info,
+            "cd": self._cmd_cd,
+            "pwd": self._cmd_pwd,
+            "ls": self._cmd_ls,
+            "list": self._cmd_ls,
+            "tree": self._cmd_tree,
+            "search": self._cmd_search,
+            "logs": self._cmd_logs,
+            "demo": self._cmd_demo,
+        }
     
     def get_prompt(self) -> str:
         """Get the CLI prompt string"""
-        mode_name = self.fs.mode.upper()
-        path = self.fs.get_current_path()
-        return f"[{mode_name}] {path}$ "
+        if self._prompt_dirty:
+            mode_name = self.fs.mode.upper()
+            path = self.fs.get_current_path()
+            self._prompt = f"[{mode_name}] {path}$ "
+            self._prompt_dirty = False
+        return self._prompt
     
     def print_error(self, message: str):
         """Print error message"""
@@ -30,29 +119,22 @@ class CLI:
     
     def print_table(self, headers: list, rows: list):
         """Print a formatted table"""
-        # Calculate column widths
-        col_widths = []
-        for i, header in enumerate(headers):
-            max_width = len(header)
-            for row in rows:
-                if i < len(row):
-                    max_width = max(max_width, len(str(row[i])))
-            col_widths.append(max_width + 2)
+        # Stringify every cell once, then size columns from those strings
+        rows_str = [[str(cell) for cell in row[:len(headers)]] for row in rows]
+        col_widths = [
+            max([len(header)] + [len(row[i]) for row in rows_str if i < len(row)]) + 2
+            for i, header in enumerate(headers)
+        ]
+        fmt = "".join(f"{{:<{width}}}" for width in col_widths)
         
         # Print header
-        header_line = ""
-        for i, header in enumerate(headers):
-            header_line += header.ljust(col_widths[i])
+        header_line = fmt.format(*headers)
         print(header_line)
         print("-" * len(header_line))
         
-        # Print rows
-        for row in rows:
-            row_line = ""
-            for i, cell in enumerate(row):
-                if i < len(col_widths):
-                    row_line += str(cell).ljust(col_widths[i])
-            print(row_line)
+        # Print rows (short rows are padded with empty cells)
+        for row in rows_str:
+            print(fmt.format(*row, *[""] * (len(col_widths) - len(row))))
     
     def execute_command(self, command: str):
         """Execute a CLI command"""
@@ -63,227 +145,178 @@ class CLI:
         cmd = parts[0].lower()
         args = parts[1:]
         
-        # Mode switching
-        if cmd == "mode":
-            if len(args) != 1:
-                self.print_error("Usage: mode <single|two-level|hierarchical>")
-                return
-            success, message = self.fs.set_mode(args[0])
-            if success:
-                self.print_success(message)
-            else:
-                self.print_error(message)
-            return
-        
-        # Help
-        if cmd == "help" or cmd == "?":
-            self.show_help()
-            return
-        
-        # Exit
-        if cmd == "exit" or cmd == "quit":
-            self.running = False
-            return
-        
-        # Reset
-        if cmd == "reset":
-            self.fs._reset_filesystem()
-            self.print_success("File system reset to initial state")
-            return
-        
-        # Create file
-        if cmd == "create":
-            if len(args) < 1:
-                self.print_error("Usage: create <filename>")
-                return
-            success, message = self.fs.create_file(args[0])
-            if success:
-                self.print_success(message)
-            else:
-                self.print_error(message)
+        handler = self._dispatch.get(cmd)
+        if handler is None:
+            self.print_error(f"Unknown command: '{cmd}'. Type 'help' for available commands")
             return
-        
-        # Create directory
-        if cmd == "mkdir":
-            if len(args) < 1:
-                self.print_error("Usage: mkdir <dirname>")
-                return
-            success, message = self.fs.create_directory(args[0])
-            if success:
-                self.print_success(message)
-            else:
-                self.print_error(message)
+        handler(args)
+    
+    def _cmd_mode(self, args: list):
+        """Switch directory structure mode (mode)"""
+        if len(args) != 1:
+            self.print_error("Usage: mode <single|two-level|hierarchical>")
             return
-        
-        # Delete
-        if cmd == "delete" or cmd == "rm":
-            if len(args) < 1:
-                self.print_error("Usage: delete <name> [--recursive]")
-                return
-            recursive = "--recursive" in args or "-r" in args
-            name = args[0]
-            success, message = self.fs.delete(name, recursive)
-            if success:
-                self.print_success(message)
-            else:
-                self.print_error(message)
+        success, message = self.fs.set_mode(args[0])
+        self._prompt_dirty = True
+        if success:
+            self.print_success(message)
+        else:
+            self.print_error(message)
+    
+    def _cmd_help(self, args: list):
+        """Show help (help, ?)"""
+        self.show_help()
+    
+    def _cmd_exit(self, args: list):
+        """Exit the emulator (exit, quit)"""
+        self.running = False
+    
+    def _cmd_reset(self, args: list):
+        """Reset the file system (reset)"""
+        self.fs._reset_filesystem()
+        self._prompt_dirty = True
+        self.print_success("File system reset to initial state")
+    
+    def _cmd_create(self, args: list):
+        """Create a file (create)"""
+        if len(args) < 1:
+            self.print_error("Usage: create <filename>")
             return
-            
-        # Rename
-        if cmd == "rename":
-            if len(args) < 2:
-                self.print_error("Usage: rename <old_name> <new_name>")
-                return
-            success, message = self.fs.rename(args[0], args[1])
-            if success:
-                self.print_success(message)
-            else:
-                self.print_error(message)
+        success, message = self.fs.create_file(args[0])
+        if success:
+            self.print_success(message)
+        else:
+            self.print_error(message)
+    
+    def _cmd_mkdir(self, args: list):
+        """Create a directory (mkdir)"""
+        if len(args) < 1:
+            self.print_error("Usage: mkdir <dirname>")
             return
-            
-        # Info
-        if cmd == "info" or cmd == "stat":
-            if len(args) < 1:
-                self.print_error("Usage: info <name>")
-                return
-            success, info, message = self.fs.get_info(args[0])
-            if success:
-                for k, v in info.items():
-                    print(f"{k.ljust(12)}: {v}")
-            else:
-                self.print_error(message)
+        success, message = self.fs.create_directory(args[0])
+        if success:
+            self.print_success(message)
+        else:
+            self.print_error(message)
+    
+    def _cmd_delete(self, args: list):
+        """Delete a file or directory (delete, rm)"""
+        if len(args) < 1:
+            self.print_error("Usage: delete <name> [--recursive]")
             return
-        
-        # Change directory
-        if cmd == "cd":
-            if len(args) < 1:
-                self.print_error("Usage: cd <path>")
-                return
-            success, message = self.fs.change_directory(args[0])
-            if not success:
-                self.print_error(message)
+        recursive = "--recursive" in args or "-r" in args
+        name = args[0]
+        success, message = self.fs.delete(name, recursive)
+        if success:
+            self.print_success(message)
+        else:
+            self.print_error(message)
+    
+    def _cmd_rename(self, args: list):
+        """Rename a file or directory (rename)"""
+        if len(args) < 2:
+            self.print_error("Usage: rename <old_name> <new_name>")
             return
-        
-        # Print working directory
-        if cmd == "pwd":
-            print(self.fs.get_current_path())
+        success, message = self.fs.rename(args[0], args[1])
+        if success:
+            self.print_success(message)
+        else:
+            self.print_error(message)
+    
+    def _cmd_info(self, args: list):
+        """Show file/directory metadata (info, stat)"""
+        if len(args) < 1:
+            self.print_error("Usage: info <name>")
             return
-        
-        # List contents
-        if cmd == "ls" or cmd == "list":
-            contents = self.fs.list_contents()
-            if not contents:
-                print("(empty directory)")
-                return
-            
-            headers = ["Name", "Type", "Size", "Created"]
-            rows = [[c['name'], c['type'], c['size'], c['created']] for c in contents]
-            self.print_table(headers, rows)
+        success, info, message = self.fs.get_info(args[0])
+        if success:
+            for k, v in info.items():
+                print(f"{k.ljust(12)}: {v}")
+        else:
+            self.print_error(message)
+    
+    def _cmd_cd(self, args: list):
+        """Change directory (cd)"""
+        if len(args) < 1:
+            self.print_error("Usage: cd <path>")
             return
-        
-        # Tree view
-        if cmd == "tree":
-            print(self.fs.get_full_tree())
+        success, message = self.fs.change_directory(args[0])
+        self._prompt_dirty = True
+        if not success:
+            self.print_error(message)
+    
+    def _cmd_pwd(self, args: list):
+        """Print working directory (pwd)"""
+        print(self.fs.get_current_path())
+    
+    def _cmd_ls(self, args: list):
+        """List directory contents (ls, list)"""
+        contents = self.fs.list_contents()
+        if not contents:
+            print("(empty directory)")
             return
         
-        # Search
-        if cmd == "search":
-            if len(args) < 1:
-                self.print_error("Usage: search <query>")
-                return
-            results = self.fs.search(args[0])
-            if not results:
-                print(f"No results found for '{args[0]}'")
-                return
-            
-            print(f"Found {len(results)} result(s) for '{args[0]}':")
-            for result in results:
-                print(f"  {result['path']} ({result['type']}, {result['size']})")
+        headers = ["Name", "Type", "Size", "Created"]
+        rows = [[c['name'], c['type'], c['size'], c['created']] for c in contents]
+        self.print_table(headers, rows)
+    
+    def _cmd_tree(self, args: list):
+        """Show ASCII tree (tree)"""
+        # Stream lines as the traversal produces them
+        sys.stdout.writelines(line + "\n" for line in self.fs.iter_full_tree())
+    
+    def _cmd_search(self, args: list):
+        """Search for files/directories (search)"""
+        if len(args) < 1:
+            self.print_error("Usage: search <query>")
             return
-        
-        # Show logs
-        if cmd == "logs":
-            logs = self.fs.get_logs()
-            if not logs:
-                print("No operations logged yet")
-                return
-            print("Operation Logs:")
-            for log in logs:
-                print(f"  {log}")
+        results = self.fs.search(args[0])
+        if not results:
+            print(f"No results found for '{args[0]}'")
             return
         
-        # Demo mode
-        if cmd == "demo":
-            self.run_demo()
+        print(f"Found {len(results)} result(s) for '{args[0]}':")
+        for result in results:
+            print(f"  {result['path']} ({result['type']}, {result['size']})")
+    
+    def _cmd_logs(self, args: list):
+        """Show operation logs (logs)"""
+        logs = self.fs.get_logs()
+        if not logs:
+            print("No operations logged yet")
             return
-        
-        # Unknown command
-        self.print_error(f"Unknown command: '{cmd}'. Type 'help' for available commands")
+        print("Operation Logs:")
+        for log in logs:
+            print(f"  {log}")
+    
+    def _cmd_demo(self, args: list):
+        """Run the demonstration (demo)"""
+        self.run_demo()
+        self._prompt_dirty = True
     
     def show_help(self):
         """Display help information"""
-        help_text = """
-╔════════════════════════════════════════════════════════════════╗
-║           File System Emulator - Help                          ║
-╚════════════════════════════════════════════════════════════════╝
-
-MODE SWITCHING:
-  mode <single|two-level|hierarchical>  Switch directory structure mode
-
-FILE OPERATIONS:
-  create <filename>                    Create a new file
-  mkdir <dirname>                      Create a new directory
-  delete <name> [--recursive]          Delete file or directory
-  rm <name> [--recursive]              Alias for delete
-  rename <old> <new>                   Rename a file or folder
-  info <name>                          Show file/folder details
-
-NAVIGATION (Two-Level & Hierarchical only):
-  cd <path>                            Change directory
-  pwd                                  Print working directory
-
-VIEWING:
-  ls / list                            List directory contents
-  tree                                 Show ASCII tree structure
-  search <query>                       Search for files/directories
-
-SYSTEM:
-  reset                                Reset file system
-  logs                                 Show operation logs
-  demo                                 Run demonstration script
-  help / ?                             Show this help
-  exit / quit                          Exit the emulator
-
-EXAMPLES:
-  mode hierarchical
-  mkdir home && cd home
-  mkdir user1 && cd user1
-  create file.txt
-  tree
-  search "*.txt"
-"""
-        print(help_text)
+        sys.stdout.write(_HELP_TEXT)
     
     def run_demo(self):
         """Run a demonstration script"""
-        print("\n" + "="*60)
-        print("RUNNING DEMONSTRATION")
-        print("="*60 + "\n")
+        # Output is collected and written once at the end instead of per line
+        out = [_DEMO_START_BANNER]
         
-        print("1️⃣ Visual Directory Tree")
+        out.append("1️⃣ Visual Directory Tree")
         
         # Phase 1: Single-Level
-        print("\n🔹 Single-Level Directory")
+        out.append("\n🔹 Single-Level Directory")
         self.fs.set_mode(FSMode.SINGLE_LEVEL)
         self.fs.create_file("file1.txt")
         self.fs.create_file("file2.doc")
         self.fs.create_file("image.png")
-        print("\nExample Output:\n")
-        print(self.fs.get_full_tree())
-        print("\nAll files are stored in one directory. No subfolders.\n")
+        out.append("\nExample Output:\n")
+        out.append(self.fs.get_full_tree())
+        out.append("\nAll files are stored in one directory. No subfolders.\n")
         
         # Phase 2: Two-Level
-        print("🔹 Two-Level Directory")
+        out.append("🔹 Two-Level Directory")
         self.fs.set_mode(FSMode.TWO_LEVEL)
         self.fs.create_directory("UserA")
         self.fs.change_directory("UserA")
@@ -294,12 +327,12 @@ EXAMPLES:
         self.fs.change_directory("UserB")
         self.fs.create_file("project.docx")
         self.fs.change_directory("..")
-        print("\nExample Output:\n")
-        print(self.fs.get_full_tree())
-        print("\nEach user has a separate folder.\n")
+        out.append("\nExample Output:\n")
+        out.append(self.fs.get_full_tree())
+        out.append("\nEach user has a separate folder.\n")
         
         # Phase 3: Hierarchical
-        print("🔹 Hierarchical (Tree-Based) Directory")
+        out.append("🔹 Hierarchical (Tree-Based) Directory")
         self.fs.set_mode(FSMode.HIERARCHICAL)
         self.fs.create_directory("Documents")
         self.fs.change_directory("Documents")
@@ -317,20 +350,20 @@ EXAMPLES:
         self.fs.change_directory("Music")
         self.fs.create_file("song.mp3")
         self.fs.change_directory("..")
-        print("\nExample Output:\n")
-        print(self.fs.get_full_tree())
-        print("\nThis supports multiple levels of folders inside folders.\n")
+        out.append("\nExample Output:\n")
+        out.append(self.fs.get_full_tree())
+        out.append("\nThis supports multiple levels of folders inside folders.\n")
 
-        print("2️⃣ File Metadata Display")
-        print("Example Output:\n")
+        out.append("2️⃣ File Metadata Display")
+        out.append("Example Output:\n")
         self.fs.change_directory("Documents/College")
         success, info, msg = self.fs.get_info("assignment.pdf")
         if success:
             for k, v in info.items():
-                print(f"{k.ljust(12)}: {v}")
+                out.append(f"{k.ljust(12)}: {v}")
         
-        print("\n\n3️⃣ Logs of Operations")
-        print("Example Output:\n")
+        out.append("\n\n3️⃣ Logs of Operations")
+        out.append("Example Output:\n")
         self.fs._reset_filesystem()
         self.fs.create_directory("Documents")
         self.fs.change_directory("Documents")
@@ -344,27 +377,23 @@ EXAMPLES:
         self.fs.change_directory("..")
         self.fs.search("trip.png")
         
-        logs = self.fs.get_logs()
-        for log in logs:
-            print(log)
+        out.extend(self.fs.get_logs())
             
-        print("\n" + "="*60)
-        print("DEMONSTRATION COMPLETE")
-        print("="*60 + "\n")
+        out.append(_DEMO_END_BANNER)
+        sys.stdout.write("\n".join(out) + "\n")
     
     def run(self):
         """Main CLI loop"""
-        print("\n" + "="*60)
-        print("  File System Emulator")
-        print("  Demonstrating OS Directory Structures")
-        print("="*60)
-        print("\nType 'help' for commands or 'demo' to see a demonstration")
-        print()
+        sys.stdout.write(_WELCOME_BANNER)
         
         while self.running:
             try:
-                command = input(self.get_prompt())
-                self.execute_command(command)
+                sys.stdout.write(self.get_prompt())
+                sys.stdout.flush()
+                command = sys.stdin.readline()
+                if not command:
+                    raise EOFError
+                self.execute_command(command.rstrip("\n"))
             except KeyboardInterrupt:
                 print("\n\nUse 'exit' to quit")
             except EOFError:
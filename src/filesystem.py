@@ -1,10 +1,59 @@
 """
 File System Manager with support for three directory structure modes
 """
+import fnmatch
+import itertools
+import operator
 import random
-from typing import List, Optional, Tuple
-from datetime import datetime
-from .models import BaseNode, FileNode, DirectoryNode, NodeType
+import re
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Set, Tuple
+from .models import BaseNode, FileNode, DirectoryNode, NodeType, name_extension
+
+# Characters not allowed in file/directory names, matched in one C-level scan
+_INVALID_CHARS = '/\\:*?"<>|'
+_INVALID_RE = re.compile(f"[{re.escape(_INVALID_CHARS)}]")
+
+# Characters that make a search query a glob rather than a literal name
+_GLOB_SPECIAL_RE = re.compile(r"[*?\[]")
+
+# ASCII tree connectors and the prefix each adds for the level below it
+_TREE_BRANCH = " ├── "
+_TREE_LAST_BRANCH = " └── "
+_TREE_INDENT = " │   "
+_TREE_LAST_INDENT = "     "
+
+
+def _random_default_size() -> int:
+    """Pick a uniformly random default file size of 1-100 KB"""
+    # Rejection-sample 7 random bits; avoids randint's range bookkeeping
+    # while staying uniform (a plain "% 100" would favour 1-28 KB)
+    kb = random.getrandbits(7)
+    while kb >= 100:
+        kb = random.getrandbits(7)
+    return (kb + 1) * 1024
+
+
+def _iter_segments(path: str) -> Iterator[str]:
+    """Yield the non-empty '/'-separated segments of path in a single pass"""
+    i = 0
+    length = len(path)
+    while i < length:
+        j = path.find("/", i)
+        if j < 0:
+            j = length
+        if j > i:
+            yield path[i:j]
+        i = j + 1
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> Pattern:
+    """Compile a wildcard pattern (*, ?, [...]) into a case-insensitive regex"""
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
 
 
 class FSMode:
@@ -21,7 +70,26 @@ class FileSystemManager:
         self.current_directory = self.root
         self.mode = FSMode.HIERARCHICAL
         self.max_depth = 10
-        self.operation_log = []
+        self.max_log_entries = 10000
+        # Ring buffer of (timestamp, message); formatted only in get_logs
+        self.operation_log = deque(maxlen=self.max_log_entries)
+        # Log timestamps only have minute resolution, so format once per minute
+        self._last_minute_key: Optional[int] = None
+        self._last_minute_str = ""
+        # Lower-cased name -> every node with that name, for wildcard-free searches
+        # (values are insertion-ordered dicts used as sets, so discards are O(1))
+        self._name_index: Dict[str, Dict[BaseNode, None]] = {}
+        # Sorted keys of _name_index, so prefix globs ("rep*") can bisect to candidates.
+        # New keys are queued and merged in on the next prefix search; removed keys stay
+        # listed (and are skipped) until they outnumber the live ones
+        self._sorted_names: List[str] = []
+        self._unsorted_names: List[str] = []
+        self._stale_names: Set[str] = set()
+        # Absolute cd path -> resolved directory; cleared when a directory is deleted or renamed
+        self._dir_cache: Dict[str, DirectoryNode] = {}
+        # Root tree_version the name index reflects; nodes attached or removed through
+        # DirectoryNode directly move the root's version past it
+        self._index_version = self.root.tree_version
     
     def set_mode(self, mode: str) -> Tuple[bool, str]:
         """Switch to a different directory structure mode"""
@@ -36,23 +104,87 @@ class FileSystemManager:
         """Reset the file system to initial state"""
         self.root = DirectoryNode("")
         self.current_directory = self.root
-        self.operation_log = []
+        self.operation_log = deque(maxlen=self.max_log_entries)
+        self._name_index = {}
+        self._sorted_names = []
+        self._unsorted_names = []
+        self._stale_names = set()
+        self._dir_cache = {}
+        self._index_version = self.root.tree_version
+    
+    def _index_add(self, node: BaseNode):
+        """Add a node to the name index"""
+        key = node.name.lower()
+        nodes = self._name_index.get(key)
+        if nodes is None:
+            nodes = self._name_index[key] = {}
+            if key in self._stale_names:
+                # Still listed from before its last node was removed
+                self._stale_names.discard(key)
+            else:
+                self._unsorted_names.append(key)
+        nodes[node] = None
+        self._index_version = self.root.tree_version
+    
+    def _index_discard(self, node: BaseNode, name: str):
+        """Remove a single node from the name index entry for name"""
+        key = name.lower()
+        nodes = self._name_index[key]
+        del nodes[node]
+        if not nodes:
+            del self._name_index[key]
+            self._stale_names.add(key)
+        self._index_version = self.root.tree_version
+    
+    def _index_remove(self, node: BaseNode):
+        """Remove a node (and, for directories, its subtree) from the name index"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._index_discard(current, current.name)
+            if current.type is NodeType.DIRECTORY:
+                stack.extend(current.children.values())
+    
+    def _sync_name_index(self):
+        """Rebuild the name index if the tree was changed without going through the manager"""
+        if self._index_version == self.root.tree_version:
+            return
+        self._name_index = {}
+        self._sorted_names = []
+        self._unsorted_names = []
+        self._stale_names = set()
+        stack = list(self.root.children.values())
+        while stack:
+            node = stack.pop()
+            self._index_add(node)
+            if node.type is NodeType.DIRECTORY:
+                stack.extend(node.children.values())
+        self._index_version = self.root.tree_version
     
     def _log_operation(self, message: str):
         """Log an operation"""
-        timestamp = datetime.now().strftime("%I:%M %p")
-        log_entry = f"[{timestamp}] {message}"
-        self.operation_log.append(log_entry)
+        self.operation_log.append((time.time(), message))
+    
+    def _format_log_time(self, timestamp: float) -> str:
+        """Format a log timestamp, reusing the string while the minute is unchanged"""
+        minute = int(timestamp // 60)
+        if minute != self._last_minute_key:
+            self._last_minute_key = minute
+            # Equivalent to strftime("%I:%M %p") without going through strftime
+            local = time.localtime(timestamp)
+            hour = local.tm_hour % 12 or 12
+            meridiem = "AM" if local.tm_hour < 12 else "PM"
+            self._last_minute_str = f"{hour:02d}:{local.tm_min:02d} {meridiem}"
+        return self._last_minute_str
     
     def _validate_name(self, name: str) -> Tuple[bool, str]:
         """Validate file/directory name"""
         if not name:
             return False, "Name cannot be empty"
         
-        invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-        for char in invalid_chars:
-            if char in name:
-                return False, f"Invalid character '{char}' in name"
+        match = _INVALID_RE.search(name)
+        if match:
+            return False, f"Invalid character '{match.group()}' in name"
         
         if len(name) > 255:
             return False, "Name exceeds maximum length of 255 characters"
@@ -65,22 +197,22 @@ class FileSystemManager:
         if not valid:
             return False, error
         
-        if self.current_directory.has_child(name):
+        # Checked before drawing a size so duplicates don't consume the RNG
+        if name in self.current_directory.children:
             return False, f"File '{name}' already exists"
         
         # Random size if not provided (1-100 KB)
         if size is None:
-            size = random.randint(1, 100) * 1024
+            size = _random_default_size()
         
         file_node = FileNode(name, self.current_directory, size)
-        success = self.current_directory.add_child(file_node)
-        
-        if success:
-            dir_name = self.current_directory.name if self.current_directory.name else "Root"
-            self._log_operation(f"File '{name}' created in {dir_name}")
-            return True, f"Created file '{name}' ({file_node.format_size()})"
+        self._sync_name_index()
+        self.current_directory.add_child(file_node)
+        self._index_add(file_node)
         
-        return False, f"Failed to create file '{name}'"
+        dir_name = self.current_directory.name if self.current_directory.name else "Root"
+        self._log_operation(f"File '{name}' created in {dir_name}")
+        return True, f"Created file '{name}' ({file_node.format_size()})"
     
     def create_directory(self, name: str) -> Tuple[bool, str]:
         """Create a new directory in the current directory"""
@@ -93,26 +225,26 @@ class FileSystemManager:
             return False, "Error: Subdirectories not allowed in Single-Level structure"
         
         if self.mode == FSMode.TWO_LEVEL:
-            current_depth = self.current_directory.get_depth()
+            current_depth = self.current_directory.depth
             if current_depth >= 1:
                 return False, "Error: Maximum depth (2 levels) exceeded in Two-Level structure"
         
         if self.mode == FSMode.HIERARCHICAL:
-            current_depth = self.current_directory.get_depth()
+            current_depth = self.current_directory.depth
             if current_depth >= self.max_depth:
                 return False, f"Error: Maximum depth ({self.max_depth} levels) exceeded"
         
-        if self.current_directory.has_child(name):
+        # Checked before construction so duplicates don't allocate a node
+        if name in self.current_directory.children:
             return False, f"Directory '{name}' already exists"
         
         dir_node = DirectoryNode(name, self.current_directory)
-        success = self.current_directory.add_child(dir_node)
-        
-        if success:
-            self._log_operation(f"Folder '{name}' created")
-            return True, f"Created directory '{name}'"
+        self._sync_name_index()
+        self.current_directory.add_child(dir_node)
+        self._index_add(dir_node)
         
-        return False, f"Failed to create directory '{name}'"
+        self._log_operation(f"Folder '{name}' created")
+        return True, f"Created directory '{name}'"
     
     def delete(self, name: str, recursive: bool = False) -> Tuple[bool, str]:
         """Delete a file or directory"""
@@ -121,13 +253,17 @@ class FileSystemManager:
         if node is None:
             return False, f"'{name}' not found"
         
-        if isinstance(node, DirectoryNode) and not node.is_empty() and not recursive:
+        if node.type is NodeType.DIRECTORY and not node.is_empty() and not recursive:
             return False, f"Directory '{name}' is not empty. Use 'delete {name} --recursive'"
         
+        self._sync_name_index()
         success = self.current_directory.remove_child(name)
         
         if success:
-            node_type = 'Folder' if isinstance(node, DirectoryNode) else 'File'
+            self._index_remove(node)
+            if node.type is NodeType.DIRECTORY:
+                self._dir_cache.clear()
+            node_type = 'Folder' if node.type is NodeType.DIRECTORY else 'File'
             self._log_operation(f"{node_type} '{name}' deleted")
             return True, f"Deleted '{name}'"
         
@@ -143,16 +279,18 @@ class FileSystemManager:
         if node is None:
             return False, f"'{old_name}' not found"
             
-        if self.current_directory.has_child(new_name):
+        self._sync_name_index()
+        if not self.current_directory.rename_child(old_name, new_name):
             return False, f"'{new_name}' already exists"
-            
-        self.current_directory.remove_child(old_name)
-        node.name = new_name
-        if isinstance(node, FileNode):
-            node.extension = new_name.split('.')[-1] if '.' in new_name else ""
-        self.current_directory.add_child(node)
+        self._index_discard(node, old_name)
+        self._index_add(node)
+        if node.type is NodeType.DIRECTORY:
+            self._dir_cache.clear()
+        
+        if node.type is NodeType.FILE:
+            node.extension = name_extension(new_name)
         
-        node_type = 'Folder' if isinstance(node, DirectoryNode) else 'File'
+        node_type = 'Folder' if node.type is NodeType.DIRECTORY else 'File'
         self._log_operation(f"{node_type} '{old_name}' renamed to '{new_name}'")
         return True, f"Renamed '{old_name}' to '{new_name}'"
 
@@ -165,7 +303,7 @@ class FileSystemManager:
         info = {
             'File Name': node.name,
             'File Size': node.format_size(),
-            'File Type': node.get_file_type() if isinstance(node, FileNode) else 'Directory',
+            'File Type': node.get_file_type() if node.type is NodeType.FILE else 'Directory',
             'Access Mode': node.access_mode,
             'Created On': node.created_at.strftime("%d-%m-%Y %I:%M %p"),
         }
@@ -185,29 +323,43 @@ class FileSystemManager:
         if path == "." or path == "":
             return True, ""
         
+        # Fast path for the common single-component "cd name"
+        if "/" not in path:
+            child = self.current_directory.children.get(path)
+            if child is None:
+                return False, f"Path not found: '{path}'"
+            if child.type is not NodeType.DIRECTORY:
+                return False, f"'{path}' is not a directory"
+            self.current_directory = child
+            return True, ""
+        
         if path.startswith("/"):
-            # Absolute path
+            # Absolute path; repeated lookups are served from the cache
+            cached = self._dir_cache.get(path)
+            if cached is not None:
+                self.current_directory = cached
+                return True, ""
             target = self.root
-            parts = [p for p in path.split("/") if p]
         else:
             # Relative path
             target = self.current_directory
-            parts = [p for p in path.split("/") if p]
         
-        for part in parts:
+        for part in _iter_segments(path):
             if part == "..":
                 if target.parent is not None:
                     target = target.parent
             elif part == ".":
                 continue
             else:
-                child = target.get_child(part)
+                child = target.children.get(part)
                 if child is None:
                     return False, f"Path not found: '{part}'"
-                if not isinstance(child, DirectoryNode):
+                if child.type is not NodeType.DIRECTORY:
                     return False, f"'{part}' is not a directory"
                 target = child
         
+        if path.startswith("/"):
+            self._dir_cache[path] = target
         self.current_directory = target
         return True, ""
     
@@ -217,83 +369,211 @@ class FileSystemManager:
     
     def list_contents(self) -> List[dict]:
         """List contents of current directory"""
-        contents = []
-        for name, node in self.current_directory.children.items():
-            contents.append({
-                'name': name,
-                'type': 'Dir' if isinstance(node, DirectoryNode) else 'File',
+        # Partition into directories and files, then sort each group by name;
+        # this avoids building a composite sort key per entry
+        dirs = []
+        files = []
+        for node in self.current_directory.children.values():
+            (dirs if node.type is NodeType.DIRECTORY else files).append(node)
+        by_name = operator.attrgetter('name')
+        dirs.sort(key=by_name)
+        files.sort(key=by_name)
+        directory = NodeType.DIRECTORY
+        return [
+            {
+                'name': node.name,
+                'type': 'Dir' if node.type is directory else 'File',
                 'size': node.format_size(),
-                'created': node.created_at.strftime("%b %d, %H:%M")
-            })
-        return sorted(contents, key=lambda x: (x['type'] == 'File', x['name']))
+                'created': node.format_created()
+            }
+            for node in itertools.chain(dirs, files)
+        ]
     
     def search(self, query: str) -> List[dict]:
         """Search for files/directories recursively"""
         results = []
-        self._search_recursive(self.current_directory, query, results)
+        self._sync_name_index()
         
-        if results:
-            first_path = results[0]['path']
-            parts = first_path.split('/')
-            found_in = parts[-2] if len(parts) > 1 and parts[-2] else "Root"
+        prefix = _GLOB_SPECIAL_RE.split(query, 1)[0]
+        if prefix == query:
+            # Wildcard-free queries are answered from the name index
+            first_parent = self._search_indexed(query, [query.lower()], None, results)
+        elif prefix:
+            # Prefix-anchored globs only need the index keys sharing that prefix
+            pattern = _compile_glob(query)
+            first_parent = self._search_indexed(query, self._index_keys_with_prefix(prefix.lower()),
+                                                pattern, results)
+        elif (len(query) > 2 and query[0] == "*" and query[-1] == "*"
+              and not _GLOB_SPECIAL_RE.search(query, 1, len(query) - 1)):
+            # "*needle*" is a plain case-insensitive substring test
+            needle = query[1:-1].lower()
+            first_parent = self._search_tree(self.current_directory,
+                                             lambda name: needle in name.lower(), results)
+        else:
+            # "*.ext" globs can prune subtrees via the descendant extension index
+            extension = None
+            if query.startswith("*.") and not any(c in query[2:] for c in "*?[."):
+                extension = query[2:].lower()
+            pattern = _compile_glob(query)
+            first_parent = self._search_tree(self.current_directory, pattern.match, results, extension)
+        
+        if first_parent is not None:
+            found_in = first_parent.name if first_parent.name else "Root"
             self._log_operation(f"Search performed for '{query}' – Found in {found_in}")
         else:
             self._log_operation(f"Search performed for '{query}' – No results found")
             
         return results
     
-    def _search_recursive(self, directory: DirectoryNode, query: str, results: List[dict]):
-        """Helper method for recursive search"""
-        for name, node in directory.children.items():
-            # Check if name matches query (supports wildcards)
-            if self._matches_pattern(name, query):
-                results.append({
-                    'name': name,
-                    'path': node.get_path(),
-                    'type': 'Dir' if isinstance(node, DirectoryNode) else 'File',
-                    'size': node.format_size()
-                })
+    def _index_keys_with_prefix(self, prefix: str) -> List[str]:
+        """Get the name index keys starting with prefix"""
+        keys = self._sorted_names
+        if self._unsorted_names:
+            # The list is one sorted run plus a few new keys, which timsort merges in linear time
+            keys.extend(self._unsorted_names)
+            keys.sort()
+            self._unsorted_names = []
+        stale = self._stale_names
+        if len(stale) * 2 > len(keys):
+            keys = self._sorted_names = [key for key in keys if key not in stale]
+            stale.clear()
+        start = bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return [key for key in keys[start:end] if key not in stale]
+    
+    def _search_indexed(self, query: str, keys: List[str], pattern: Optional[Pattern],
+                        results: List[dict]) -> Optional[DirectoryNode]:
+        """Search via the name index (optionally filtered by pattern); returns the first hit's parent"""
+        base = self.current_directory
+        # Keys absent below the current directory need no further checks
+        keys = [key for key in keys if key in base.descendant_names]
+        # The index is global, so once it holds more candidates than the subtree has
+        # nodes, walking the subtree is cheaper than checking each candidate's ancestry
+        if sum(len(self._name_index[key]) for key in keys) > base.descendant_count:
+            return self._search_tree(base, _compile_glob(query).match, results)
+        
+        matches = []
+        for key in keys:
+            for node in self._name_index[key]:
+                if (pattern is None or pattern.match(node.name)) and self._is_under(node, base):
+                    matches.append(node)
+        
+        # Report hits in the same pre-order a tree walk would produce
+        if len(matches) > 1:
+            self._sort_preorder(matches)
+        for node in matches:
+            results.append(self._search_result(node))
+        return matches[0].parent if matches else None
+    
+    def _is_under(self, node: BaseNode, directory: DirectoryNode) -> bool:
+        """Check if node is a strict descendant of directory"""
+        current = node.parent
+        while current is not None:
+            if current is directory:
+                return True
+            current = current.parent
+        return False
+    
+    def _sort_preorder(self, nodes: List[BaseNode]):
+        """Sort nodes into the order a pre-order walk of the tree would visit them"""
+        # Per-directory name -> sibling position maps, built once per directory touched
+        positions: Dict[DirectoryNode, Dict[str, int]] = {}
+        
+        def preorder_key(node: BaseNode) -> List[int]:
+            key = []
+            while node.parent is not None:
+                parent = node.parent
+                sibling_positions = positions.get(parent)
+                if sibling_positions is None:
+                    sibling_positions = {name: i for i, name in enumerate(parent.children)}
+                    positions[parent] = sibling_positions
+                key.append(sibling_positions[node.name])
+                node = parent
+            key.reverse()
+            return key
+        
+        nodes.sort(key=preorder_key)
+    
+    def _search_result(self, node: BaseNode) -> dict:
+        """Build the result entry search reports for a node"""
+        return {
+            'name': node.name,
+            'path': node.get_path(),
+            'type': 'Dir' if node.type is NodeType.DIRECTORY else 'File',
+            'size': node.format_size()
+        }
+    
+    def _search_tree(self, directory: DirectoryNode, matches: Callable[[str], object],
+                     results: List[dict], extension: Optional[str] = None) -> Optional[DirectoryNode]:
+        """Helper method for search; returns the parent of the first match (or None)"""
+        first_parent = None
+        if not self._may_contain_match(directory, extension):
+            return first_parent
+        
+        # Iterative pre-order walk; children are pushed in reverse so they pop in insertion order
+        stack = list(reversed(directory.children.values()))
+        while stack:
+            node = stack.pop()
+            is_dir = node.type is NodeType.DIRECTORY
+            # Check if name matches the query
+            if matches(node.name):
+                results.append(self._search_result(node))
+                if first_parent is None:
+                    first_parent = node.parent
             
-            # Recursively search in subdirectories
-            if isinstance(node, DirectoryNode):
-                self._search_recursive(node, query, results)
+            # Descend into subdirectories that may hold a match
+            if is_dir and self._may_contain_match(node, extension):
+                stack.extend(reversed(node.children.values()))
+        
+        return first_parent
     
-    def _matches_pattern(self, name: str, pattern: str) -> bool:
-        """Check if name matches pattern (supports * and ? wildcards)"""
-        import re
-        # Convert wildcard pattern to regex
-        regex_pattern = pattern.replace('.', r'\.')
-        regex_pattern = regex_pattern.replace('*', '.*')
-        regex_pattern = regex_pattern.replace('?', '.')
-        regex_pattern = f"^{regex_pattern}$"
-        return re.match(regex_pattern, name, re.IGNORECASE) is not None
+    def _may_contain_match(self, directory: DirectoryNode, extension: Optional[str]) -> bool:
+        """Check the descendant extension index to see if a subtree can contain a match"""
+        if extension is not None:
+            return extension in directory.descendant_extensions
+        return True
     
     def get_tree(self) -> str:
         """Get ASCII tree representation of current directory"""
-        return self._build_tree(self.current_directory, "", True)
+        return "".join(line + "\n" for line in self._iter_tree(self.current_directory, ""))
     
-    def _build_tree(self, directory: DirectoryNode, prefix: str, is_last: bool) -> str:
-        """Build ASCII tree recursively"""
-        result = ""
-        children = list(directory.children.values())
-        
-        for i, child in enumerate(children):
-            is_last_child = (i == len(children) - 1)
-            connector = " └── " if is_last_child else " ├── "
+    def _iter_tree(self, directory: DirectoryNode, prefix: str) -> Iterator[str]:
+        """Yield ASCII tree lines for directory lazily, using an explicit stack"""
+        stack = []
+        
+        def push_children(parent: DirectoryNode, parent_prefix: str):
+            # Pushed in reverse so siblings pop in insertion order; the
+            # first child pushed is therefore the last one displayed
+            for i, child in enumerate(reversed(parent.children.values())):
+                stack.append((child, parent_prefix, i == 0))
+        
+        push_children(directory, prefix)
+        while stack:
+            child, child_prefix, is_last_child = stack.pop()
+            connector = _TREE_LAST_BRANCH if is_last_child else _TREE_BRANCH
             
-            if isinstance(child, DirectoryNode):
-                result += f"{prefix}{connector}{child.name}/\n"
-                new_prefix = prefix + ("     " if is_last_child else " │   ")
-                result += self._build_tree(child, new_prefix, is_last_child)
+            if child.type is NodeType.DIRECTORY:
+                yield f"{child_prefix}{connector}{child.name}/"
+                push_children(child, child_prefix + (_TREE_LAST_INDENT if is_last_child else _TREE_INDENT))
             else:
-                result += f"{prefix}{connector}{child.name}\n"
-        
-        return result
+                yield f"{child_prefix}{connector}{child.name}"
+    
+    def iter_full_tree(self) -> Iterator[str]:
+        """Yield the ASCII tree from root line by line"""
+        # Hold one line back so the final one can be rstripped, matching get_full_tree
+        previous = "Root/"
+        for line in self._iter_tree(self.root, ""):
+            yield previous
+            previous = line
+        yield previous.rstrip()
     
     def get_full_tree(self) -> str:
         """Get ASCII tree from root"""
-        return f"Root/\n{self._build_tree(self.root, '', True)}".rstrip()
+        return "\n".join(self.iter_full_tree())
     
     def get_logs(self) -> List[str]:
         """Get operation logs"""
-        return self.operation_log
+        return [f"[{self._format_log_time(timestamp)}] {message}"
+                for timestamp, message in self.operation_log]
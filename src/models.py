@@ -2,7 +2,7 @@
 Core Node classes for File System Emulator
 """
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 
@@ -11,26 +11,74 @@ class NodeType(Enum):
     DIRECTORY = "DIRECTORY"
 
 
+# Lower-cased file extension -> human-readable file type
+_TYPE_MAP = {
+    'pdf': 'PDF Document',
+    'doc': 'Word Document',
+    'docx': 'Word Document',
+    'txt': 'Text Document',
+    'png': 'PNG Image',
+    'jpg': 'JPEG Image',
+    'jpeg': 'JPEG Image',
+    'mp3': 'Audio File',
+    'mp4': 'Video File'
+}
+
+
+def name_extension(name: str) -> str:
+    """Get the lower-cased extension of a name ("" if it has none)"""
+    return name.rpartition('.')[2].lower() if '.' in name else ""
+
+
 class BaseNode:
     """Base class for all file system nodes"""
     
+    __slots__ = ('name', 'type', 'parent', 'created_at', 'modified_at', 'size',
+                 'access_mode', '_path_cache', '_size_cache', '_created_label')
+    
     def __init__(self, name: str, node_type: NodeType, parent: Optional['BaseNode'] = None):
         self.name = name
         self.type = node_type
         self.parent = parent
-        self.created_at = datetime.now()
-        self.modified_at = datetime.now()
+        now = datetime.now()
+        self.created_at = now
+        self.modified_at = now
         self.size = 0  # bytes
         self.access_mode = "Read / Write"
+        self._path_cache: Optional[str] = None
+        # (size, formatted size) from the last format_size call
+        self._size_cache: Optional[Tuple[int, str]] = None
+        # Listing label for created_at, formatted on first use
+        self._created_label: Optional[str] = None
     
     def get_path(self) -> str:
-        """Get absolute path of this node"""
-        if self.parent is None:
-            return "/" + self.name if self.name != "" else "/"
-        parent_path = self.parent.get_path()
-        if parent_path == "/":
-            return "/" + self.name
-        return parent_path + "/" + self.name
+        """Get absolute path of this node (cached until name or parent changes)"""
+        if self._path_cache is not None:
+            return self._path_cache
+        
+        # Walk up to the nearest cached ancestor (or the root), then fill the
+        # caches on the way back down so later lookups below it are O(1)
+        uncached = []
+        node = self
+        while node is not None and node._path_cache is None:
+            uncached.append(node)
+            node = node.parent
+        
+        for node in reversed(uncached):
+            if node.parent is None:
+                path = "/" + node.name if node.name != "" else "/"
+            else:
+                parent_path = node.parent._path_cache
+                if parent_path == "/":
+                    path = "/" + node.name
+                else:
+                    path = parent_path + "/" + node.name
+            node._path_cache = path
+        return self._path_cache
+    
+    def _invalidate_path(self):
+        """Drop the cached path of this node"""
+        self._path_cache = None
     
     def update_modified(self):
         """Update the modified timestamp"""
@@ -38,39 +86,44 @@ class BaseNode:
     
     def format_size(self) -> str:
         """Format size in human-readable format"""
+        # Reuse the last result while the size is unchanged
+        cache = self._size_cache
+        if cache is not None and cache[0] == self.size:
+            return cache[1]
+        
         if self.size < 1024:
-            return f"{self.size} B"
+            formatted = f"{self.size} B"
         elif self.size < 1024 * 1024:
-            return f"{self.size / 1024:.1f} KB"
+            formatted = f"{self.size / 1024:.1f} KB"
         else:
-            return f"{self.size / (1024 * 1024):.1f} MB"
+            formatted = f"{self.size / (1024 * 1024):.1f} MB"
+        self._size_cache = (self.size, formatted)
+        return formatted
+    
+    def format_created(self) -> str:
+        """Format the creation time for directory listings"""
+        # created_at never changes, so the label is formatted at most once
+        if self._created_label is None:
+            self._created_label = self.created_at.strftime("%b %d, %H:%M")
+        return self._created_label
 
 
 class FileNode(BaseNode):
     """Represents a file in the file system"""
     
+    __slots__ = ('extension',)
+    
     def __init__(self, name: str, parent: Optional[BaseNode] = None, size: int = 0):
         super().__init__(name, NodeType.FILE, parent)
         self.size = size
-        self.extension = name.split('.')[-1] if '.' in name else ""
+        self.extension = name_extension(name)
     
     def get_file_type(self) -> str:
-        ext = self.extension.lower()
-        type_map = {
-            'pdf': 'PDF Document',
-            'doc': 'Word Document',
-            'docx': 'Word Document',
-            'txt': 'Text Document',
-            'png': 'PNG Image',
-            'jpg': 'JPEG Image',
-            'jpeg': 'JPEG Image',
-            'mp3': 'Audio File',
-            'mp4': 'Video File'
-        }
-        if ext in type_map:
-            return type_map[ext]
-        elif ext:
-            return f"{ext.upper()} File"
+        file_type = _TYPE_MAP.get(self.extension)
+        if file_type:
+            return file_type
+        elif self.extension:
+            return f"{self.extension.upper()} File"
         return "Unknown File Type"
         
     def __repr__(self):
@@ -80,9 +133,22 @@ class FileNode(BaseNode):
 class DirectoryNode(BaseNode):
     """Represents a directory in the file system"""
     
+    __slots__ = ('children', 'depth', 'descendant_names', 'descendant_extensions',
+                 'descendant_count', 'tree_version')
+    
     def __init__(self, name: str, parent: Optional[BaseNode] = None):
         super().__init__(name, NodeType.DIRECTORY, parent)
         self.children: Dict[str, BaseNode] = {}
+        self.depth = parent.depth + 1 if parent is not None else 0
+        # Lower-cased names/extensions of every descendant -> occurrence count,
+        # used by search to skip subtrees that cannot contain a match
+        self.descendant_names: Dict[str, int] = {}
+        self.descendant_extensions: Dict[str, int] = {}
+        # Number of files and directories beneath this directory
+        self.descendant_count = 0
+        # Bumped on a tree's root whenever a node anywhere in it is added, removed
+        # or renamed, so callers can tell when state derived from the tree is stale
+        self.tree_version = 0
     
     def add_child(self, node: BaseNode) -> bool:
         """Add a child node to this directory"""
@@ -90,6 +156,11 @@ class DirectoryNode(BaseNode):
             return False
         self.children[node.name] = node
         node.parent = self
+        node._invalidate_path()
+        # Directories created elsewhere (or moved) need their stored depths refreshed
+        if node.type is NodeType.DIRECTORY and node.depth != self.depth + 1:
+            node._set_depth(self.depth + 1)
+        self._update_descendant_index(node, 1)
         self.update_modified()
         return True
     
@@ -97,10 +168,76 @@ class DirectoryNode(BaseNode):
         """Remove a child node from this directory"""
         if name not in self.children:
             return False
-        del self.children[name]
+        node = self.children.pop(name)
+        node._invalidate_path()
+        self._update_descendant_index(node, -1)
         self.update_modified()
         return True
     
+    def rename_child(self, old_name: str, new_name: str) -> bool:
+        """Rename a child in place (fails if old_name is missing or new_name is taken)"""
+        if new_name in self.children or old_name not in self.children:
+            return False
+        node = self.children.pop(old_name)
+        node.name = new_name
+        self.children[new_name] = node
+        node._invalidate_path()
+        # Descendants are unchanged, so only the renamed entry moves in the indexes
+        self._apply_index_delta({old_name.lower(): 1}, {name_extension(old_name): 1}, -1)
+        self._apply_index_delta({new_name.lower(): 1}, {name_extension(new_name): 1}, 1)
+        self.update_modified()
+        return True
+    
+    def _invalidate_path(self):
+        """Drop the cached paths of this directory and everything beneath it"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._path_cache = None
+            if node.type is NodeType.DIRECTORY:
+                stack.extend(node.children.values())
+    
+    def _set_depth(self, depth: int):
+        """Set the depth of this directory and shift its subdirectories to match"""
+        stack = [(self, depth)]
+        while stack:
+            directory, directory_depth = stack.pop()
+            directory.depth = directory_depth
+            for child in directory.children.values():
+                if child.type is NodeType.DIRECTORY:
+                    stack.append((child, directory_depth + 1))
+    
+    def _update_descendant_index(self, node: BaseNode, delta: int):
+        """Add (delta=1) or remove (delta=-1) node's subtree in this directory's and its ancestors' indexes"""
+        names = {node.name.lower(): 1}
+        extensions = {name_extension(node.name): 1}
+        if node.type is NodeType.DIRECTORY:
+            for key, count in node.descendant_names.items():
+                names[key] = names.get(key, 0) + count
+            for key, count in node.descendant_extensions.items():
+                extensions[key] = extensions.get(key, 0) + count
+        
+        self._apply_index_delta(names, extensions, delta)
+    
+    def _apply_index_delta(self, names: Dict[str, int], extensions: Dict[str, int], delta: int):
+        """Apply name/extension counts to the indexes of this directory and its ancestors"""
+        # Every node is counted under exactly one name, so the name counts sum to the node count
+        node_count = delta * sum(names.values())
+        current = root = self
+        while current is not None:
+            current.descendant_count += node_count
+            for index, counts in ((current.descendant_names, names),
+                                  (current.descendant_extensions, extensions)):
+                for key, count in counts.items():
+                    total = index.get(key, 0) + delta * count
+                    if total > 0:
+                        index[key] = total
+                    else:
+                        index.pop(key, None)
+            root = current
+            current = current.parent
+        root.tree_version += 1
+    
     def get_child(self, name: str) -> Optional[BaseNode]:
         """Get a child node by name"""
         return self.children.get(name)
@@ -115,12 +252,7 @@ class DirectoryNode(BaseNode):
     
     def get_depth(self) -> int:
         """Get the depth of this directory from root"""
-        depth = 0
-        current = self.parent
-        while current is not None:
-            depth += 1
-            current = current.parent
-        return depth
+        return self.depth
     
     def __repr__(self):
         return f"DirectoryNode({self.name}, {len(self.children)} children)"